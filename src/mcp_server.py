@@ -8,17 +8,21 @@ from mcp.types import (
 from mcp.shared.exceptions import McpError
 
 import asyncio
-from pydantic import BaseModel, Field
+import functools
+from pydantic import BaseModel, Field, ValidationError, field_validator
 from src.logger import Logger
 from src.config import DEFAULT_TIMEOUT_SECONDS
 from src.output_format_handler import OutputFormat
-from src.utils import filter_none_values
+from src.utils import filter_none_values, is_valid_url
 
 from src.scraper import extract_text_from_url
 
 
 logger = Logger(__name__)
 
+# String values accepted for output_format, resolved with one dict lookup
+_OUTPUT_FORMATS = {fmt.value: fmt for fmt in OutputFormat}
+
 
 class ScrapeArgs(BaseModel):
     """Parameters for web scraping."""
@@ -62,11 +66,57 @@ class ScrapeArgs(BaseModel):
         description="Additional HTML elements (CSS selectors) to remove before extraction."
     )
 
+    @field_validator("url")
+    @classmethod
+    def _check_url(cls, url: str) -> str:
+        if not url:
+            raise ValueError("URL is required")
+        if not is_valid_url(url):
+            raise ValueError(f"URL must be an absolute http(s) URL: {url!r}")
+        return url
+
+
+def parse_scrape_args(arguments: dict) -> ScrapeArgs:
+    """
+    Validate scrape_web arguments, raising McpError(INVALID_PARAMS) on bad input.
+
+    Messages raised by ScrapeArgs' own validators (e.g. "URL is required")
+    are passed through as-is rather than wrapped in pydantic's report.
+    """
+    # Create a filtered copy of arguments without mutating the original
+    filtered_arguments = filter_none_values(arguments)
+
+    try:
+        return ScrapeArgs(**filtered_arguments)
+    except ValidationError as e:
+        details = e.errors()
+        if all(d["type"] == "value_error" for d in details):
+            message = "; ".join(str(d["ctx"]["error"]) for d in details)
+        else:
+            message = str(e)
+        logger.error(f"Invalid parameters: {message}")
+        raise McpError(ErrorData(code=INVALID_PARAMS, message=message))
+
+
+@functools.cache
+def get_scrape_tool_schema() -> dict:
+    """
+    JSON schema for the scrape_web tool, generated from ScrapeArgs once per process.
+    """
+    return ScrapeArgs.model_json_schema()
+
 
 async def mcp_extract_text_map(url: str, *args, **kwargs) -> dict:
     """
     MCP-specific wrapper for extract_text_from_url that returns a dict with status, extracted_text, and final_url.
     """
+    output_format = kwargs.get("output_format")
+    if isinstance(output_format, str):
+        if output_format not in _OUTPUT_FORMATS:
+            logger.error(
+                f"Invalid output_format: {output_format}, defaulting to MARKDOWN")
+        kwargs["output_format"] = _OUTPUT_FORMATS.get(
+            output_format, OutputFormat.MARKDOWN)
     result = await extract_text_from_url(url, *args, **kwargs)
     if result.get("error"):
         return {
@@ -96,7 +146,7 @@ async def serve(custom_user_agent: str | None = None):
             Tool(
                 name="scrape_web",
                 description="Scrapes a webpage and extracts its main content",
-                inputSchema=ScrapeArgs.model_json_schema(),
+                inputSchema=get_scrape_tool_schema(),
             )
         ]
 
@@ -129,20 +179,8 @@ async def serve(custom_user_agent: str | None = None):
             raise McpError(ErrorData(code=INVALID_PARAMS,
                            message=f"Unknown tool: {name}"))
 
-        # Create a filtered copy of arguments without mutating the original
-        filtered_arguments = filter_none_values(arguments)
-
-        try:
-            args = ScrapeArgs(**filtered_arguments)
-        except ValueError as e:
-            logger.error(f"Invalid parameters: {e}")
-            raise McpError(ErrorData(code=INVALID_PARAMS, message=str(e)))
-
+        args = parse_scrape_args(arguments)
         url = args.url
-        if not url:
-            logger.error("URL is required")
-            raise McpError(ErrorData(code=INVALID_PARAMS,
-                           message="URL is required"))
 
         # Call our existing scraper function
         logger.info(f"Scraping URL: {url}")
@@ -191,12 +229,11 @@ async def serve(custom_user_agent: str | None = None):
         logger.info(f"Scraping URL for prompt: {url}")
         output_format = arguments.get("output_format", OutputFormat.MARKDOWN)
         if isinstance(output_format, str):
-            try:
-                output_format = OutputFormat(output_format)
-            except ValueError:
+            if output_format not in _OUTPUT_FORMATS:
                 logger.error(
                     f"Invalid output_format: {output_format}, defaulting to MARKDOWN")
-                output_format = OutputFormat.MARKDOWN
+            output_format = _OUTPUT_FORMATS.get(
+                output_format, OutputFormat.MARKDOWN)
         result = await extract_text_from_url(url, output_format=output_format)
 
         if result.get("error"):
@@ -5,6 +5,7 @@ from src.config import (
     DEFAULT_MIN_CONTENT_LENGTH,
     DEFAULT_MIN_CONTENT_LENGTH_SEARCH_APP)
 from src.logger import Logger
+from src.utils import is_valid_url
 from .helpers.rate_limiting import get_domain_from_url, apply_rate_limiting
 from .helpers.browser import _setup_browser_context, USER_AGENTS, VIEWPORTS, LANGUAGES
 from .helpers.content_selectors import _wait_for_content_stabilization
@@ -91,7 +92,17 @@ async def extract_text_from_url(url: str,
         Dictionary with ``title``, ``final_url``, ``content`` and an
         ``error`` message if one occurred.
     """
+    if not is_valid_url(url):
+        logger.warning(f"Refusing to scrape invalid URL: {url}")
+        return {
+            "title": None,
+            "final_url": url,
+            "content": None,
+            "error": f"[ERROR] Invalid URL: {url}",
+        }
+
     timeout_seconds = custom_timeout if custom_timeout is not None else DEFAULT_TIMEOUT_SECONDS
+    original_domain = get_domain_from_url(url)
 
     try:
         async with async_playwright() as p:
@@ -104,7 +115,7 @@ async def extract_text_from_url(url: str,
             try:
                 browser, context, page = await _setup_browser_context(p, ua, viewport, accept_language, timeout_seconds)
 
-                await apply_rate_limiting(url)
+                await apply_rate_limiting(url, original_domain)
                 logger.debug(f"Navigating to URL: {url}")
                 response, nav_error = await _navigate_and_handle_errors(page, url, timeout_seconds)
 
@@ -189,7 +200,6 @@ async def extract_text_from_url(url: str,
                         "error": content_error,
                     }
 
-                original_domain = get_domain_from_url(url)
                 min_content_length = (
                     DEFAULT_MIN_CONTENT_LENGTH_SEARCH_APP
                     if original_domain and "search.app" in original_domain
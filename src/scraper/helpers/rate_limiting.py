@@ -1,4 +1,5 @@
 import asyncio
+import functools
 import time
 from urllib.parse import urlparse
 from src.logger import Logger
@@ -12,6 +13,15 @@ MIN_SECONDS_BETWEEN_REQUESTS = DEFAULT_MIN_SECONDS_BETWEEN_REQUESTS
 
 
 def get_domain_from_url(url):
+    if not isinstance(url, str):
+        logger.warning(f"Could not parse domain from URL: {url}")
+        return None
+
+    return _parse_domain(url)
+
+
+@functools.lru_cache(maxsize=256)
+def _parse_domain(url):
     try:
         parsed = urlparse(url)
         domain = parsed.netloc
@@ -26,14 +36,15 @@ def get_domain_from_url(url):
         return None
 
 
-async def apply_rate_limiting(url: str):
-    domain = get_domain_from_url(url)
+async def apply_rate_limiting(url: str, domain: str | None = None):
+    if domain is None:
+        domain = get_domain_from_url(url)
 
     if not domain:
         logger.warning(f"No valid domain for rate limiting: {url}")
         return
     async with _domain_lock:
-        current_time = time.time()
+        current_time = time.monotonic()
         last_access_time = _domain_access_times.get(domain)
 
         if last_access_time:
@@ -45,6 +56,6 @@ async def apply_rate_limiting(url: str):
                 logger.warning(
                     f"Rate limiting {domain}: Sleeping for {sleep_duration:.2f}s")
                 await asyncio.sleep(sleep_duration)
-                current_time = time.time()
+                current_time = time.monotonic()
 
         _domain_access_times[domain] = current_time
@@ -1,3 +1,12 @@
+import functools
+from urllib.parse import urlparse
+
+# Schemes the scraper will hand to the browser
+ALLOWED_SCHEMES = frozenset({"http", "https"})
+_ALLOWED_PREFIXES = tuple(f"{scheme}://" for scheme in ALLOWED_SCHEMES)
+_MAX_PREFIX_LENGTH = max(map(len, _ALLOWED_PREFIXES))
+
+
 def filter_none_values(d: dict) -> dict:
     """
     Return a new dictionary with all key-value pairs from d where the value is not None or "null".
@@ -9,3 +18,30 @@ def filter_none_values(d: dict) -> dict:
         dict: A new dictionary with None and "null" values removed.
     """
     return {k: v for k, v in d.items() if v is not None and v != "null"}
+
+
+def is_valid_url(url: str) -> bool:
+    """
+    Return True if url is an absolute http(s) URL with a host.
+
+    Args:
+        url (str): The URL to check.
+
+    Returns:
+        bool: True for http/https URLs with a non-empty netloc, False otherwise.
+    """
+    if not url or not isinstance(url, str):
+        return False
+    # Schemes are case-insensitive; most bad URLs are rejected here unparsed
+    if not url[:_MAX_PREFIX_LENGTH].lower().startswith(_ALLOWED_PREFIXES):
+        return False
+    return _parse_ok(url)
+
+
+@functools.lru_cache(maxsize=256)
+def _parse_ok(url: str) -> bool:
+    try:
+        parsed = urlparse(url)
+    except ValueError:
+        return False
+    return bool(parsed.netloc)
@@ -1,6 +1,123 @@
+import asyncio
 import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 
+import pytest
+import requests
+from pytest_asyncio import is_async_test
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
 ROOT_DIR = Path(__file__).resolve().parents[1]
 if str(ROOT_DIR) not in sys.path:
     sys.path.insert(0, str(ROOT_DIR))
+
+from tests.helpers import JS_DELAY_MARKER, JS_DELAY_MS  # noqa: E402
+
+EXAMPLE_PAGE = """<!doctype html>
+<html>
+<head><title>Example Domain</title></head>
+<body>
+<div>
+<h1>Example Domain</h1>
+<p>This domain is for use in illustrative examples in documents. You may use
+this domain in literature without prior coordination or asking for permission.</p>
+</div>
+</body>
+</html>"""
+
+NOT_FOUND_PAGE = """<!doctype html>
+<html>
+<head><title>404 Not Found</title></head>
+<body><h1>Not Found</h1></body>
+</html>"""
+
+JS_DELAY_PAGE = EXAMPLE_PAGE.replace("</body>", f"""<script>
+setTimeout(() => {{
+  const late = document.createElement("p");
+  late.id = "late";
+  late.textContent = "{JS_DELAY_MARKER}";
+  document.body.appendChild(late);
+}}, {JS_DELAY_MS});
+</script>
+</body>""")
+
+# Canned responses served by the local_server fixture, keyed by path
+LOCAL_PAGES = {
+    "/": (200, EXAMPLE_PAGE),
+    "/js-delay": (200, JS_DELAY_PAGE),
+    "/status/404": (404, NOT_FOUND_PAGE),
+}
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--run-network", action="store_true", default=False,
+        help="run tests marked network (they need live Internet access)")
+
+
+def pytest_collection_modifyitems(config, items):
+    # Run every async test on the session loop, so session-scoped async
+    # fixtures and module-level asyncio primitives share a single loop
+    session_loop = pytest.mark.asyncio(loop_scope="session")
+    # Live-Internet tests only run when --run-network is given
+    run_network = config.getoption("--run-network")
+    skip_network = pytest.mark.skip(reason="needs Internet; use --run-network")
+    for item in items:
+        if is_async_test(item):
+            item.add_marker(session_loop, append=False)
+        if not run_network and "network" in item.keywords:
+            item.add_marker(skip_network)
+
+
+@pytest.fixture(scope="session")
+def event_loop_policy():
+    """uvloop when installed, otherwise the stock asyncio policy."""
+    if uvloop is not None:
+        return uvloop.EventLoopPolicy()
+    return asyncio.DefaultEventLoopPolicy()
+
+
+class _LocalPageHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        status, body = LOCAL_PAGES.get(self.path, (404, NOT_FOUND_PAGE))
+        payload = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture(scope="session")
+def local_server():
+    """Serve LOCAL_PAGES over HTTP on loopback and yield the base URL."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _LocalPageHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture(scope="session")
+def http_session():
+    """Keep-alive HTTP session shared by every test that fetches pages directly."""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=32, pool_maxsize=32,
+        max_retries=Retry(total=2, backoff_factor=0.3))
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    yield session
+    session.close()
@@ -1,5 +1,16 @@
+import html as html_lib
+import re
 from urllib.parse import urlparse
 
+# First <a> whose quoted href looks like an article page, matched on raw bytes
+ARTICLE_LINK_RE = re.compile(
+    rb"""<a\s(?:[^>]*?\s)?href\s*=\s*["']([^"']*/(?:article|news|story|202|p/)[^"']*)["']""",
+    re.IGNORECASE)
+
+# The local /js-delay page appends JS_DELAY_MARKER this long after load
+JS_DELAY_MS = 3000
+JS_DELAY_MARKER = "Late content appended by script"
+
 
 def discover_rss_feeds(domain_url: str) -> list[str]:
     """Tries to discover RSS feeds for the given domain URL.
@@ -115,40 +126,57 @@ def extract_article_from_feed(feed_data):
 
         return None
 
-    # Try to find an entry with title, link and preferably a summary
+    # Try to find an entry with title, link and preferably a summary,
+    # remembering the first entry with any valid link as a fallback
+
+    fallback_link = None
 
     for entry in feed_data.entries:
 
-        if hasattr(
-            entry,
-            'link') and entry.link and urlparse(
-            entry.link).scheme in [
-            'http',
-                'https']:
-            # Prioritize entries that have a title and summary/content
-
-            if hasattr(
-                entry,
-                'title') and (
-                hasattr(
-                    entry,
-                    'summary') or hasattr(
-                    entry,
-                    'content')):
-
-                return entry.link
+        link = getattr(entry, 'link', None)
+
+        if not link or urlparse(link).scheme not in ('http', 'https'):
+            continue
+
+        # Prioritize entries that have a title and summary/content
+
+        if hasattr(entry, 'title') and (
+                hasattr(entry, 'summary') or hasattr(entry, 'content')):
+
+            return link
+
+        if fallback_link is None:
+            fallback_link = link
 
     # Fall back to any entry with a valid link
 
-    for entry in feed_data.entries:
+    return fallback_link
+
+
+def find_article_link(html, domain, encoding=None):
+    """Find the first article-like link in a homepage's HTML.
+    Scans the raw markup with a regex instead of building a DOM.
+    Returns an absolute URL, or None if no suitable link was found."""
+
+    if isinstance(html, str):
+        html = html.encode("utf-8")
+        encoding = "utf-8"
+
+    match = ARTICLE_LINK_RE.search(html)
+
+    if match is None:
+
+        return None
+
+    href = html_lib.unescape(
+        match.group(1).decode(encoding or "utf-8", errors="replace"))
+
+    if href.startswith("/"):
+
+        return f"https://{domain}{href}"
 
-        if hasattr(
-            entry,
-            'link') and entry.link and urlparse(
-            entry.link).scheme in [
-            'http',
-                'https']:
+    if href.startswith("http"):
 
-            return entry.link
+        return href
 
     return None
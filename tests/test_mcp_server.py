@@ -1,50 +1,84 @@
+import re
 import pytest
+from mcp.shared.exceptions import McpError
+from pydantic import ValidationError
 import random
-from src.mcp_server import mcp_extract_text_map
+import src.mcp_server
+from src.mcp_server import (
+    ScrapeArgs, get_scrape_tool_schema, mcp_extract_text_map, parse_scrape_args)
 from src.scraper.helpers.browser import USER_AGENTS
 from src.output_format_handler import OutputFormat
 
 
-@pytest.mark.asyncio
-async def test_call_tool_with_string_result():
+async def _extract_example_com(output_format):
     arguments = {
         "url": "http://example.com",
         "max_length": None,
         "timeout_seconds": 30,
         "wait_for_network_idle": True,
         "user_agent": random.choice(USER_AGENTS),
-        "output_format": OutputFormat.TEXT,
+        "output_format": output_format,
     }
-    result = await mcp_extract_text_map(
+    return await mcp_extract_text_map(
         arguments["url"],
+        custom_timeout=arguments["timeout_seconds"],
         max_length=arguments["max_length"],
         user_agent=arguments["user_agent"],
         wait_for_network_idle=arguments["wait_for_network_idle"],
         output_format=arguments["output_format"],
     )
+
+
+@pytest.fixture
+def stub_example_com(monkeypatch):
+    """Serve example.com from a canned result instead of launching a browser."""
+    real_extract = src.mcp_server.extract_text_from_url
+
+    async def fake_extract(url, *args, **kwargs):
+        if "example.com" in url:
+            return {
+                "title": "Example Domain",
+                "final_url": url,
+                "content": "Example Domain\nThis domain is for use in illustrative examples in documents.",
+                "error": None,
+            }
+        return await real_extract(url, *args, **kwargs)
+
+    monkeypatch.setattr(src.mcp_server, "extract_text_from_url", fake_extract)
+
+
+async def test_call_tool_with_string_result(stub_example_com):
+    result = await _extract_example_com(OutputFormat.TEXT)
     assert isinstance(result, dict)
     assert "status" in result
     assert "extracted_text" in result
     assert "final_url" in result
 
 
-@pytest.mark.asyncio
+@pytest.mark.parametrize("output_format, expected", [
+    ("text", OutputFormat.TEXT),
+    ("html", OutputFormat.HTML),
+    ("markdown", OutputFormat.MARKDOWN),
+    ("not-a-format", OutputFormat.MARKDOWN),
+])
+async def test_string_output_format_is_coerced(monkeypatch, output_format, expected):
+    seen = {}
+
+    async def fake_extract(url, *args, **kwargs):
+        seen["output_format"] = kwargs.get("output_format")
+        return {"title": "Example Domain", "final_url": url,
+                "content": "Example Domain", "error": None}
+
+    monkeypatch.setattr(src.mcp_server, "extract_text_from_url", fake_extract)
+    result = await _extract_example_com(output_format)
+    assert result["status"] == "success"
+    assert seen["output_format"] is expected
+
+
+@pytest.mark.network
 async def test_call_tool_with_string_output_format_text():
-    arguments = {
-        "url": "http://example.com",
-        "max_length": None,
-        "timeout_seconds": 30,
-        "wait_for_network_idle": True,
-        "user_agent": random.choice(USER_AGENTS),
-        "output_format": "text",  # Pass as string, as MCP protocol would
-    }
-    result = await mcp_extract_text_map(
-        arguments["url"],
-        max_length=arguments["max_length"],
-        user_agent=arguments["user_agent"],
-        wait_for_network_idle=arguments["wait_for_network_idle"],
-        output_format=arguments["output_format"],
-    )
+    # Pass as string, as MCP protocol would
+    result = await _extract_example_com("text")
     assert isinstance(result, dict)
     assert result["status"] == "success"
     content = result["extracted_text"]
@@ -52,3 +86,32 @@ async def test_call_tool_with_string_output_format_text():
     # Should be plain text, not markdown or HTML
     assert not content.strip().startswith("#"), "Output is markdown, not plain text!"
     assert "Example Domain" in content
+
+
+def test_scrape_tool_schema_is_built_once():
+    schema = get_scrape_tool_schema()
+    assert schema is get_scrape_tool_schema()
+    assert "url" in schema["properties"]
+    assert schema["required"] == ["url"]
+
+
+def test_scrape_args_accepts_http_url():
+    assert ScrapeArgs(url="https://example.com").url == "https://example.com"
+
+
+@pytest.mark.parametrize("url, message", [
+    ("", "URL is required"),
+    ("ftp://x", "absolute http(s) URL"),
+    ("not-a-valid-url", "absolute http(s) URL"),
+])
+def test_scrape_args_rejects_invalid_url(url, message):
+    with pytest.raises(ValidationError, match=re.escape(message)):
+        ScrapeArgs(url=url)
+
+
+def test_parse_scrape_args_reports_plain_url_message():
+    with pytest.raises(McpError) as exc_info:
+        parse_scrape_args({"url": ""})
+    message = str(exc_info.value)
+    assert "URL is required" in message
+    assert "validation error" not in message.lower()
@@ -1,10 +1,7 @@
 import pytest
 import asyncio
-import re
-import requests
-import random
-from bs4 import BeautifulSoup
-from urllib.parse import urlparse
+from types import SimpleNamespace
+from lxml import etree
 from src.config import (
     DEFAULT_MIN_SECONDS_BETWEEN_REQUESTS,
     DEFAULT_TEST_REQUEST_TIMEOUT,
@@ -13,69 +10,107 @@ from src.config import (
 )
 
 from src.scraper import extract_text_from_url, get_domain_from_url, apply_rate_limiting
-from src.output_format_handler import OutputFormat
+from src.scraper.helpers import rate_limiting
+from src.output_format_handler import OutputFormat, format_content, truncate_content
 from src.scraper.helpers.browser import USER_AGENTS
+from tests.helpers import JS_DELAY_MARKER, JS_DELAY_MS, find_article_link
 
+# The first article link almost always sits within the first 64KB of a homepage
+_HOMEPAGE_PROBE_BYTES = 64 * 1024
+# Domains probed by test_dynamic_article_extraction
+_DOMAINS = [
+    ("techcrunch.com", "/"),
+    ("dev.to", "/"),
+]
 
-@pytest.mark.asyncio
-async def test_extract_text_from_example_com():
-    url = "http://example.com"
+
+async def test_extract_text_from_local_page(local_server):
+    url = f"{local_server}/"
     result = await extract_text_from_url(url)
     assert isinstance(result, dict)
-    assert result.get("title") is not None
-    assert "Example Domain" in (result.get("title") or "") or "Example Domain" in (
-        result.get("content") or "")
-    assert result.get("content") is not None
-    assert result.get("final_url") in [
-        url, url + "/", "https://www.example.com", "https://www.example.com/"]
     assert not result.get("error")
+    assert result.get("title") == "Example Domain"
+    assert "Example Domain" in (result.get("content") or "")
+    assert result.get("final_url") == url
+
+
+@pytest.mark.parametrize("output_format, check", [
+    (OutputFormat.TEXT,
+     lambda c: "Example Domain" in c and "<" not in c and "==" not in c and not c.startswith("#")),
+    (OutputFormat.MARKDOWN,
+     lambda c: "Example Domain" in c and ("==" in c or "#" in c)),
+    (OutputFormat.HTML, lambda c: "<h1>Example Domain</h1>" in c),
+], ids=["text", "markdown", "html"])
+async def test_extract_text_from_local_page_output(local_server, output_format, check):
+    result = await extract_text_from_url(f"{local_server}/", output_format=output_format)
+    assert not result.get("error"), f"Unexpected error: {result.get('error')}"
+    content = result.get("content") or ""
+    assert check(content), f"Unexpected {output_format.value} output: {content!r}"
 
 
-@pytest.mark.asyncio
-async def test_extract_text_from_example_com_text_output():
-    url = "http://example.com"
-    result = await extract_text_from_url(url, output_format=OutputFormat.TEXT)
-    if result.get("error"):
-        pytest.skip(f"Extraction failed: {result['error']}")
-    assert "Example Domain" in result.get("content", "")
+async def test_extract_text_from_local_page_with_max_length(local_server):
+    result = await extract_text_from_url(
+        f"{local_server}/", output_format=OutputFormat.HTML, max_length=50)
+    assert not result.get("error"), f"Unexpected error: {result.get('error')}"
+    html = result.get("content")
+    assert html is not None
+    assert len(html) <= 50 + len("\n\n[Content truncated due to length]")
+    assert etree.HTML(html) is not None
 
 
-@pytest.mark.asyncio
-async def test_extract_text_from_example_com_markdown_output():
-    url = "http://example.com"
-    result = await extract_text_from_url(url, output_format=OutputFormat.MARKDOWN)
-    if result.get("error"):
-        pytest.skip(f"Extraction failed: {result['error']}")
-    content = result.get("content") or ""
-    assert "Example Domain" in content
-    assert "==" in content or "#" in content
+@pytest.fixture(scope="session")
+async def example_com_result():
+    """Scrape example.com once as HTML and share the result.
 
+    The text and markdown variants convert this HTML instead of re-running
+    the browser pipeline.
+    """
+    return await extract_text_from_url("http://example.com", output_format=OutputFormat.HTML)
 
-@pytest.mark.asyncio
-async def test_extract_text_from_example_com_html_output():
-    url = "http://example.com"
-    result = await extract_text_from_url(url, output_format=OutputFormat.HTML)
+
+def _example_com_html(result):
     if result.get("error"):
         pytest.skip(f"Extraction failed: {result['error']}")
-    html = result.get("content")
-    assert html is not None
-    BeautifulSoup(html, "html.parser")
+    return result.get("content")
 
 
-@pytest.mark.asyncio
-async def test_extract_text_from_example_com_with_max_length():
+@pytest.mark.network
+def test_extract_text_from_example_com(example_com_result):
     url = "http://example.com"
-    result = await extract_text_from_url(url, max_length=50, output_format=OutputFormat.HTML)
+    result = example_com_result
     assert isinstance(result, dict)
-    if result.get("error"):
-        pytest.skip(f"Extraction failed: {result['error']}")
-    html = result.get("content")
+    assert result.get("title") is not None
+    assert "Example Domain" in (result.get("title") or "") or "Example Domain" in (
+        result.get("content") or "")
+    assert result.get("content") is not None
+    assert result.get("final_url") in [
+        url, url + "/", "https://www.example.com", "https://www.example.com/"]
+    assert not result.get("error")
+
+
+@pytest.mark.network
+@pytest.mark.parametrize("output_format, check", [
+    (OutputFormat.TEXT, lambda c: "Example Domain" in c),
+    (OutputFormat.MARKDOWN,
+     lambda c: "Example Domain" in c and ("==" in c or "#" in c)),
+    (OutputFormat.HTML, lambda c: etree.HTML(c) is not None),
+], ids=["text", "markdown", "html"])
+def test_extract_text_from_example_com_output(example_com_result, output_format, check):
+    html = _example_com_html(example_com_result)
+    assert html is not None
+    content = format_content(html, output_format) or ""
+    assert check(content), f"Unexpected {output_format.value} output: {content!r}"
+
+
+@pytest.mark.network
+def test_extract_text_from_example_com_with_max_length(example_com_result):
+    html = truncate_content(_example_com_html(example_com_result), 50)
     assert html is not None
     assert len(html) <= 50 + len("\n\n[Content truncated due to length]")
-    BeautifulSoup(html, "html.parser")
+    assert etree.HTML(html) is not None
 
 
-@pytest.mark.asyncio
+@pytest.mark.network
 async def test_extract_text_from_wikipedia():
     url = "https://en.wikipedia.org/wiki/Web_scraping"
     result = await extract_text_from_url(url)
@@ -90,9 +125,8 @@ async def test_extract_text_from_wikipedia():
         "final_url", "").startswith("https://en.wikipedia.org/wiki/")
 
 
-@pytest.mark.asyncio
 async def test_nonexistent_domain():
-    url = "https://nonexistent-domain-for-testing-12345.com/somepage"
+    url = "https://nonexistent-domain-for-testing.invalid/somepage"
     result = await extract_text_from_url(url)
     assert isinstance(result, dict)
     assert result.get("error")
@@ -100,7 +134,6 @@ async def test_nonexistent_domain():
         "error") or "error" in result.get("error").lower()
 
 
-@pytest.mark.asyncio
 async def test_invalid_url_format():
     url = "not-a-valid-url"
     result = await extract_text_from_url(url)
@@ -110,7 +143,13 @@ async def test_invalid_url_format():
         "error").lower() or "error" in result.get("error").lower()
 
 
-@pytest.mark.asyncio
+async def test_http_404_local_page(local_server):
+    result = await extract_text_from_url(f"{local_server}/status/404")
+    assert isinstance(result, dict)
+    assert "404" in (result.get("error") or ""), f"Unexpected error: {result.get('error')}"
+
+
+@pytest.mark.network
 async def test_http_404_page():
     # Use a URL that should reliably return 404 - a non-existent page on a reliable domain
     url = "https://example.com/this-page-definitely-does-not-exist-404-test"
@@ -123,104 +162,139 @@ async def test_http_404_page():
                "404", "not found", "timeout", "error"]), f"Unexpected error: {result.get('error')}"
 
 
-def test_get_domain_from_url():
-    assert get_domain_from_url("https://example.com") == "example.com"
-    assert get_domain_from_url("https://www.example.com") == "example.com"
-    assert get_domain_from_url(
-        "http://blog.example.com/post/123") == "blog.example.com"
-    assert get_domain_from_url(
-        "https://example.com:8080") == "example.com:8080"
-    assert get_domain_from_url("not-a-url") is None
-    assert get_domain_from_url("") is None
+@pytest.mark.parametrize("url, expected", [
+    ("https://example.com", "example.com"),
+    ("https://www.example.com", "example.com"),
+    ("http://blog.example.com/post/123", "blog.example.com"),
+    ("https://example.com:8080", "example.com:8080"),
+    ("not-a-url", None),
+    ("", None),
+    (None, None),
+    (["https://example.com"], None),
+])
+def test_get_domain_from_url(url, expected):
+    assert get_domain_from_url(url) == expected
+
+
+class _FakeClock:
+    """Virtual clock for the rate limiter: sleeping records the delay and advances time."""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
 
+    def monotonic(self):
+        return self.now
 
-@pytest.mark.asyncio
-async def test_rate_limiting():
+    async def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def fake_clock(monkeypatch):
+    """Point the rate limiter's clock and sleep at a _FakeClock."""
+    clock = _FakeClock()
+    monkeypatch.setattr(rate_limiting, "_domain_access_times", {})
+    monkeypatch.setattr(rate_limiting, "time", SimpleNamespace(monotonic=clock.monotonic))
+    monkeypatch.setattr(rate_limiting, "asyncio",
+                        SimpleNamespace(sleep=clock.sleep))
+    return clock
+
+
+async def test_rate_limiting(fake_clock):
     domain = "test-domain.com"
     url = f"https://{domain}"
-    start_time = asyncio.get_event_loop().time()
 
+    start = fake_clock.now
     await apply_rate_limiting(url)
-    first_request_time = asyncio.get_event_loop().time() - start_time
-    start_time = asyncio.get_event_loop().time()
+    assert fake_clock.now == start, f"First request was delayed: {fake_clock.sleeps}"
 
+    start = fake_clock.now
     await apply_rate_limiting(url)
-    second_request_time = asyncio.get_event_loop().time() - start_time
+    elapsed = fake_clock.now - start
+    assert elapsed >= DEFAULT_MIN_SECONDS_BETWEEN_REQUESTS - \
+        0.1, f"Rate limiting not working, delay was only {elapsed} seconds"
 
-    assert second_request_time >= DEFAULT_MIN_SECONDS_BETWEEN_REQUESTS - \
-        0.1, f"Rate limiting not working, delay was only {second_request_time} seconds"
     different_url = "https://different-domain.com"
-    start_time = asyncio.get_event_loop().time()
-
+    start = fake_clock.now
     await apply_rate_limiting(different_url)
-    different_domain_time = asyncio.get_event_loop().time() - start_time
+    different_domain_time = fake_clock.now - start
 
     assert different_domain_time < DEFAULT_TEST_NO_DELAY_THRESHOLD, f"Different domain was delayed: {different_domain_time} seconds"
 
 
-@pytest.mark.asyncio
-async def test_extract_real_article():
-    url = "https://en.wikipedia.org/wiki/Web_scraping"
-    result = await extract_text_from_url(url)
-    if result.get("error"):
-        pytest.skip(f"Extraction failed: {result}")
-    assert isinstance(result, dict)
-    assert result.get("title") is not None
-    assert "Web scraping" in (result.get("title") or "") or "Web scraping" in (
-        result.get("content") or "")
-    assert result.get("content") is not None
-    assert result.get("final_url") == url or result.get(
-        "final_url", "").startswith("https://en.wikipedia.org/wiki/")
+def _fetch_homepage_prefix(http_session, url):
+    """Return the first ``_HOMEPAGE_PROBE_BYTES`` of ``url`` and its encoding."""
+    with http_session.get(url, timeout=DEFAULT_TEST_REQUEST_TIMEOUT, stream=True) as resp:
+        return resp.raw.read(_HOMEPAGE_PROBE_BYTES, decode_content=True), resp.encoding
 
 
-@pytest.mark.asyncio
-async def test_dynamic_article_extraction_random_domain():
+async def _fetch_and_extract_article(http_session, domain, start_path):
     """
-    Picks a random domain from the list and tests article extraction for that domain.
-    Uses only reliable domains with consistent article structures.
+    Finds an article link on the domain's homepage and extracts it.
+    Returns a ``(domain, status, detail)`` tuple where ``status`` is "ok"
+    (``detail`` is ``(link, result)``) or "skip" (``detail`` is the reason).
     """
-    domains = [
-        ("techcrunch.com", "/"),
-        ("dev.to", "/"),
-    ]
-    domain, start_path = random.choice(domains)
     start_url = f"https://{domain}{start_path or '/'}"
     try:
-        resp = requests.get(start_url, timeout=DEFAULT_TEST_REQUEST_TIMEOUT)
-        soup = BeautifulSoup(resp.text, "html.parser")
-        link = None
-        for a in soup.find_all("a", href=True):
-            href = a["href"]
-            if any(x in href for x in ["/article", "/news", "/story", "/202", "/p/"]):
-                if href.startswith("/"):
-                    link = f"https://{domain}{href}"
-                elif href.startswith("http"):
-                    link = href
-                break
+        # Run the blocking homepage fetch off the event loop so the
+        # domains' requests overlap
+        body, encoding = await asyncio.to_thread(
+            _fetch_homepage_prefix, http_session, start_url)
+        link = find_article_link(body, domain, encoding)
         if not link:
-            pytest.skip(
-                f"Could not dynamically find an article link on {start_url}")
-            return
+            return domain, "skip", f"Could not dynamically find an article link on {start_url}"
     except Exception as e:
-        pytest.skip(f"Failed to fetch homepage for {domain}: {e}")
-        return
+        return domain, "skip", f"Failed to fetch homepage for {domain}: {e}"
     result = await extract_text_from_url(link)
     if result.get("error") and "Cloudflare challenge" in result.get("error"):
-        pytest.skip(f"Cloudflare challenge detected for {link}")
-        return
+        return domain, "skip", f"Cloudflare challenge detected for {link}"
     if result.get("error"):
-        pytest.skip(f"Extraction failed for {link}: {result}")
-        return
-    assert isinstance(result, dict)
-    assert result.get("title") is not None
-    assert result.get("content") is not None
-    content = result.get("content") or ""
-    if 'dev.to' not in link and 'forem.com' not in link:
-        assert len(
-            content) >= DEFAULT_MIN_CONTENT_LENGTH, f"Extracted text too short ({len(content)} chars) for {link}"
+        return domain, "skip", f"Extraction failed for {link}: {result}"
+    return domain, "ok", (link, result)
+
+
+@pytest.mark.network
+async def test_dynamic_article_extraction(http_session):
+    """
+    Tests article extraction for every domain in the list concurrently.
+    Uses only reliable domains with consistent article structures.
+    Checks each domain as soon as it finishes, so a broken extraction fails
+    without waiting for the slowest site. Skips only if no domain yielded an
+    extractable article.
+    """
+    tasks = [
+        asyncio.create_task(_fetch_and_extract_article(
+            http_session, domain, start_path))
+        for domain, start_path in _DOMAINS
+    ]
+    skipped = []
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            domain, status, detail = await next_done
+            if status != "ok":
+                skipped.append(f"{domain}: {detail}")
+                continue
+            link, result = detail
+            assert isinstance(result, dict)
+            assert result.get("title") is not None, f"Missing title for {link}"
+            assert result.get("content") is not None, f"Missing content for {link}"
+            content = result.get("content") or ""
+            if 'dev.to' not in link and 'forem.com' not in link:
+                assert len(
+                    content) >= DEFAULT_MIN_CONTENT_LENGTH, f"Extracted text too short ({len(content)} chars) for {link}"
+    finally:
+        # Don't leave slower domains running on the shared loop after a failure
+        for task in tasks:
+            task.cancel()
+        # Let cancelled scrapes finish closing their browsers before moving on
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    if len(skipped) == len(tasks):
+        pytest.skip("; ".join(skipped))
 
 
-@pytest.mark.asyncio
 async def test_missing_url_argument():
     result = await extract_text_from_url("")
     assert isinstance(result, dict)
@@ -230,46 +304,39 @@ async def test_missing_url_argument():
 
 
 
-@pytest.mark.asyncio
-async def test_grace_period_seconds_js_delay():
+async def test_grace_period_seconds_js_delay(local_server):
     """
     This test validates that the grace_period_seconds parameter works correctly.
-    Tests that different grace periods don't crash and function properly.
+    The page appends JS_DELAY_MARKER JS_DELAY_MS after load, so only a grace
+    period longer than that delay should capture it.
     """
-    test_url = "https://example.com"  # Use a reliable, simple site
-
-    # Test that different grace periods work without errors
-    result_short = await extract_text_from_url(test_url, grace_period_seconds=0.1)
-    result_medium = await extract_text_from_url(test_url, grace_period_seconds=0.5)
-    result_long = await extract_text_from_url(test_url, grace_period_seconds=1.0)
-
-    # All should succeed and return content
-    assert result_short.get("content") is not None, "Short grace period failed"
-    assert result_medium.get("content") is not None, "Medium grace period failed"
-    assert result_long.get("content") is not None, "Long grace period failed"
-    
+    test_url = f"{local_server}/js-delay"
+    long_grace = JS_DELAY_MS / 1000 * 2
+
+    # The scrapes are independent, so run them concurrently
+    result_short, result_long = await asyncio.gather(
+        extract_text_from_url(test_url, grace_period_seconds=0.1),
+        extract_text_from_url(test_url, grace_period_seconds=long_grace),
+    )
+
     # None should have errors
     assert not result_short.get("error"), f"Short grace period returned error: {result_short.get('error')}"
-    assert not result_medium.get("error"), f"Medium grace period returned error: {result_medium.get('error')}"
     assert not result_long.get("error"), f"Long grace period returned error: {result_long.get('error')}"
-    
-    # All should have similar content (since example.com is static)
-    content_short = result_short.get("content", "")
-    content_medium = result_medium.get("content", "")
-    content_long = result_long.get("content", "")
-    
-    # Verify grace period parameter is actually being used (no crash/error indicates success)
-    assert len(content_short) > 0, "Content should not be empty"
-    assert len(content_medium) > 0, "Content should not be empty"
-    assert len(content_long) > 0, "Content should not be empty"
-
-
-@pytest.mark.asyncio
+
+    content_short = result_short.get("content") or ""
+    content_long = result_long.get("content") or ""
+
+    assert "Example Domain" in content_short, "Short grace period failed"
+    assert JS_DELAY_MARKER not in content_short, "Short grace period waited for the delayed script"
+    assert JS_DELAY_MARKER in content_long, "Long grace period missed the delayed content"
+
+
+@pytest.mark.network
 async def test_custom_user_agent_and_no_network_idle():
     url = "http://example.com"
     result = await extract_text_from_url(
         url,
-        user_agent=random.choice(USER_AGENTS),
+        user_agent=USER_AGENTS[0],
         wait_for_network_idle=False,
     )
     assert isinstance(result, dict)
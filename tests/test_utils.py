@@ -1,32 +1,37 @@
 import pytest
-from src.utils import filter_none_values
+from src.utils import filter_none_values, is_valid_url
 
 
-def test_filter_none_values_typical():
-    d = {'a': 1, 'b': None, 'c': 3, 'd': None}
-    assert filter_none_values(d) == {'a': 1, 'c': 3}
-
-
-def test_filter_none_values_all_none():
-    d = {'a': None, 'b': None}
-    assert filter_none_values(d) == {}
-
-
-def test_filter_none_values_no_none():
-    d = {'a': 0, 'b': '', 'c': False, 'd': []}
+@pytest.mark.parametrize("d, expected", [
+    ({'a': 1, 'b': None, 'c': 3, 'd': None}, {'a': 1, 'c': 3}),
+    ({'a': None, 'b': None}, {}),
     # 0, '', False, [] are not None, so should be kept
-    assert filter_none_values(d) == d
-
-
-def test_filter_none_values_empty():
-    d = {}
-    assert filter_none_values(d) == {}
-
-
-def test_filter_none_values_nested():
-    d = {'a': None, 'b': {'x': None}, 'c': [None, 1], 'd': 2}
+    ({'a': 0, 'b': '', 'c': False, 'd': []},
+     {'a': 0, 'b': '', 'c': False, 'd': []}),
+    ({}, {}),
     # Only top-level None is removed
-    assert filter_none_values(d) == {'b': {'x': None}, 'c': [None, 1], 'd': 2}
+    ({'a': None, 'b': {'x': None}, 'c': [None, 1], 'd': 2},
+     {'b': {'x': None}, 'c': [None, 1], 'd': 2}),
+    ({'a': 1, 'b': None, 'c': 'null', 'd': 3, 'e': 'null'}, {'a': 1, 'd': 3}),
+    ({'a': None, 'b': 'null', 'c': 'valid', 'd': 0, 'e': 'null', 'f': None},
+     {'c': 'valid', 'd': 0}),
+    ({'a': 'null', 'b': 'null', 'c': 'null'}, {}),
+    # Should only filter exact "null" strings, not strings containing "null"
+    ({'a': 'null_value', 'b': 'not_null', 'c': 'null', 'd': None},
+     {'a': 'null_value', 'b': 'not_null'}),
+], ids=[
+    "typical",
+    "all_none",
+    "no_none",
+    "empty",
+    "nested",
+    "with_null_strings",
+    "mixed_none_and_null",
+    "only_null_strings",
+    "preserves_valid_strings_containing_null",
+])
+def test_filter_none_values(d, expected):
+    assert filter_none_values(d) == expected
 
 
 def test_filter_none_values_does_not_mutate_input():
@@ -36,22 +41,28 @@ def test_filter_none_values_does_not_mutate_input():
     assert original == copy, "filter_none_values should not mutate its input dict"
 
 
-def test_filter_none_values_with_null_strings():
-    d = {'a': 1, 'b': None, 'c': 'null', 'd': 3, 'e': 'null'}
-    assert filter_none_values(d) == {'a': 1, 'd': 3}
-
-
-def test_filter_none_values_mixed_none_and_null():
-    d = {'a': None, 'b': 'null', 'c': 'valid', 'd': 0, 'e': 'null', 'f': None}
-    assert filter_none_values(d) == {'c': 'valid', 'd': 0}
-
-
-def test_filter_none_values_only_null_strings():
-    d = {'a': 'null', 'b': 'null', 'c': 'null'}
-    assert filter_none_values(d) == {}
-
-
-def test_filter_none_values_preserves_valid_strings_containing_null():
-    d = {'a': 'null_value', 'b': 'not_null', 'c': 'null', 'd': None}
-    # Should only filter exact "null" strings, not strings containing "null"
-    assert filter_none_values(d) == {'a': 'null_value', 'b': 'not_null'}
+@pytest.mark.parametrize("url", [
+    "http://example.com",
+    "https://example.com/path?q=1",
+    "http://localhost:8000",
+    "http://127.0.0.1:8080/status/404",
+    "HTTPS://Example.com",
+])
+def test_is_valid_url_accepts_http_urls(url):
+    assert is_valid_url(url)
+
+
+@pytest.mark.parametrize("url", [
+    "",
+    None,
+    "not-a-valid-url",
+    "file:///etc/passwd",
+    "javascript:alert(1)",
+    "ftp://example.com/file.txt",
+    "https://",
+    "http:/example.com",
+    "http://[::1",
+    ["http://example.com"],
+])
+def test_is_valid_url_rejects_other_urls(url):
+    assert not is_valid_url(url)